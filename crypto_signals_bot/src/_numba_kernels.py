@@ -0,0 +1,169 @@
+# _numba_kernels.py
+"""Numba-compiled hot-loop kernels for the strategy evaluators.
+
+Holds the tight numeric loops that don't vectorize well as pandas/NumPy
+expressions: the RSI-divergence pivot scan and the fused EMA9/21 pass.
+Falls back to plain Python (still over NumPy arrays) when numba is not
+installed.
+"""
+import numpy as np
+
+# Explicit float64 signatures make every kernel compile eagerly at import
+# (no first-call JIT pause after a restart) and give LLVM fixed layouts to
+# vectorize against; fastmath is enabled only on the pure-arithmetic EMA
+# kernels, where strict IEEE ordering doesn't affect the thresholds.
+try:
+    from numba import njit, prange, types
+
+    # pandas copy-on-write hands out read-only views from to_numpy(), so
+    # the array argument types must be declared readonly to match.
+    _F8_RO = types.Array(types.float64, 1, "A", readonly=True)
+    _F8_2D_RO = types.Array(types.float64, 2, "A", readonly=True)
+    _PIVOT_SIG = types.UniTuple(types.int64, 3)(_F8_RO, types.int64, types.boolean)
+    _EMA_TAIL_SIG = types.UniTuple(types.float64, 6)(_F8_RO)
+    _EMA_TAIL_2D_SIG = types.Array(types.float64, 2, "C")(_F8_2D_RO)
+    _ATR_SIG = types.float64(_F8_RO, _F8_RO, _F8_RO, types.int64)
+except ImportError:  # numba is optional — run the kernels as plain Python
+    def njit(*args, **kwargs):
+        def wrap(func):
+            return func
+        if args and callable(args[0]):
+            return args[0]
+        return wrap
+
+    prange = range
+    _PIVOT_SIG = _EMA_TAIL_SIG = _EMA_TAIL_2D_SIG = _ATR_SIG = None
+
+@njit(_PIVOT_SIG, cache=True, boundscheck=False)
+def _last_two_pivots(values: np.ndarray, window: int, find_min: bool):
+    """Scan backward for the last two centered-window pivots.
+
+    A pivot at i satisfies values[i] == min (or max) of
+    values[i - window//2 : i + window//2 + 1], mirroring
+    rolling(window, center=True) == series. Returns (i1, i2, recent)
+    where i1 < i2 are positional indices (-1 if missing) and recent is
+    the pivot count within the last 10 bars.
+    """
+    n = values.shape[0]
+    half = window // 2
+    i1 = -1
+    i2 = -1
+    recent = 0
+    for i in range(n - half - 1, half - 1, -1):
+        ext = values[i - half]
+        for j in range(i - half + 1, i + half + 1):
+            v = values[j]
+            if find_min:
+                if v < ext:
+                    ext = v
+            else:
+                if v > ext:
+                    ext = v
+        if values[i] == ext:
+            if i >= n - 10:
+                recent += 1
+            if i2 == -1:
+                i2 = i
+            elif i1 == -1:
+                i1 = i
+        # Once both pivots are found and the recent-count window has been
+        # fully scanned there is nothing left to learn.
+        if i1 != -1 and i < n - 10:
+            break
+    return i1, i2, recent
+
+# Thin Python wrappers: keeping the default window argument out of the
+# jitted layer lets _last_two_pivots compile against one fixed signature.
+def find_last_two_pivots_low(low: np.ndarray, window: int = 5):
+    return _last_two_pivots(low, window, True)
+
+def find_last_two_pivots_high(high: np.ndarray, window: int = 5):
+    return _last_two_pivots(high, window, False)
+
+@njit(_EMA_TAIL_SIG, cache=True, fastmath=True, boundscheck=False)
+def ema9_21_tail(close: np.ndarray):
+    """Compute EMA9 and EMA21 in one lockstep pass over close.
+
+    The crossover check only reads the last three values of each EMA, so
+    instead of materializing two full Series (two walks over close, two
+    n-length allocations) this folds both adjust=False recurrences in a
+    single loop and returns just the tails:
+    (e9[-3], e9[-2], e9[-1], e21[-3], e21[-2], e21[-1]).
+    """
+    a9 = 2.0 / (9 + 1)
+    a21 = 2.0 / (21 + 1)
+    e9 = close[0]
+    e21 = close[0]
+    e9_1 = e9_2 = e9
+    e21_1 = e21_2 = e21
+    for i in range(1, close.shape[0]):
+        e9_2 = e9_1
+        e9_1 = e9
+        e21_2 = e21_1
+        e21_1 = e21
+        e9 = a9 * close[i] + (1.0 - a9) * e9
+        e21 = a21 * close[i] + (1.0 - a21) * e21
+    return e9_2, e9_1, e9, e21_2, e21_1, e21
+
+@njit(_EMA_TAIL_2D_SIG, cache=True, parallel=True, fastmath=True, boundscheck=False)
+def ema9_21_tail_2d(close_2d: np.ndarray) -> np.ndarray:
+    """Column-parallel variant of ema9_21_tail for batch evaluation.
+
+    close_2d is (n_bars, n_pairs); each column is one pair's close
+    series. Returns a (6, n_pairs) array with rows
+    (e9[-3], e9[-2], e9[-1], e21[-3], e21[-2], e21[-1]).
+    """
+    a9 = 2.0 / (9 + 1)
+    a21 = 2.0 / (21 + 1)
+    n, m = close_2d.shape
+    out = np.empty((6, m))
+    for j in prange(m):
+        e9 = close_2d[0, j]
+        e21 = close_2d[0, j]
+        e9_1 = e9_2 = e9
+        e21_1 = e21_2 = e21
+        for i in range(1, n):
+            e9_2 = e9_1
+            e9_1 = e9
+            e21_2 = e21_1
+            e21_1 = e21
+            e9 = a9 * close_2d[i, j] + (1.0 - a9) * e9
+            e21 = a21 * close_2d[i, j] + (1.0 - a21) * e21
+        out[0, j] = e9_2
+        out[1, j] = e9_1
+        out[2, j] = e9
+        out[3, j] = e21_2
+        out[4, j] = e21_1
+        out[5, j] = e21
+    return out
+
+@njit(_ATR_SIG, cache=True, boundscheck=False)
+def atr_last(high: np.ndarray, low: np.ndarray, close: np.ndarray, window: int) -> float:
+    """Last ATR value: SMA-seeded Wilder recurrence over true range.
+
+    Replicates ta.volatility.AverageTrueRange (true range with the first
+    bar's high-low, an SMA seed over the first window, then Wilder
+    smoothing) without materializing the true-range or ATR Series.
+    """
+    n = high.shape[0]
+    seed = high[0] - low[0]
+    for i in range(1, window):
+        tr = high[i] - low[i]
+        d1 = abs(high[i] - close[i - 1])
+        if d1 > tr:
+            tr = d1
+        d2 = abs(low[i] - close[i - 1])
+        if d2 > tr:
+            tr = d2
+        seed += tr
+    atr = seed / window
+    for i in range(window, n):
+        tr = high[i] - low[i]
+        d1 = abs(high[i] - close[i - 1])
+        if d1 > tr:
+            tr = d1
+        d2 = abs(low[i] - close[i - 1])
+        if d2 > tr:
+            tr = d2
+        atr = (atr * (window - 1) + tr) / window
+    return atr
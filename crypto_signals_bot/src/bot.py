@@ -1,20 +1,40 @@
 import os
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from telegram import Update
+from telegram.error import NetworkError, TimedOut
 from telegram.ext import Application, CommandHandler, ContextTypes
+from telegram.request import HTTPXRequest
 from crypto_signals_bot.src.strategies import Signal
 from signal_cache import SignalCache
 from dotenv import load_dotenv
 import asyncio
 
+__all__ = [
+    "application",
+    "bot",
+    "alert_queue",
+    "format_alert",
+    "start_alert_flusher",
+    "send_telegram_alert",
+    "status_command",
+    "setup_telegram_bot",
+]
+
 load_dotenv()
 
-# Configure logging for bot
+# Configure logging for bot: records go through an in-memory queue and a
+# background listener thread does the file writes, so log calls on the
+# event loop never block on disk I/O.
 bot_logger = logging.getLogger("bot")
 bot_logger.setLevel(logging.INFO)
-handler = logging.FileHandler("bot.log")
-handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
-bot_logger.addHandler(handler)
+_log_queue: queue.Queue = queue.Queue(-1)
+bot_logger.addHandler(QueueHandler(_log_queue))
+_file_handler = logging.FileHandler("bot.log", delay=True)
+_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+_log_listener = QueueListener(_log_queue, _file_handler)
+_log_listener.start()
 
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
@@ -23,26 +43,110 @@ if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID:
     bot_logger.error("Missing TELEGRAM_TOKEN or TELEGRAM_CHAT_ID environment variables.")
     raise RuntimeError("Missing TELEGRAM_TOKEN or TELEGRAM_CHAT_ID")
 
+# One HTTPX pool for outbound API sends. Updates arrive via the
+# /telegram webhook in main.py, so there is no getUpdates long poll to
+# isolate from. Size is tunable via env vars.
+send_request = HTTPXRequest(
+    connection_pool_size=int(os.getenv("TELEGRAM_SEND_POOL_SIZE", "32")),
+    pool_timeout=float(os.getenv("TELEGRAM_SEND_POOL_TIMEOUT", "10.0")),
+)
+
+# Build the Application once at import so every alert reuses the same
+# persistent HTTP connection pool instead of paying a TCP+TLS handshake
+# per send. main.py initializes/shuts it down on app startup/shutdown.
+application = (
+    Application.builder()
+    .token(TELEGRAM_TOKEN)
+    .request(send_request)
+    .build()
+)
+bot = application.bot
+
+# Alert batching: webhook handlers enqueue formatted messages and a
+# background flusher coalesces everything that arrives within the flush
+# window into one send_message call, staying under Telegram's 4096 limit.
+BATCH_FLUSH_INTERVAL = float(os.getenv("ALERT_BATCH_FLUSH_INTERVAL", "2.0"))
+MAX_BUFFER_CHARS = 3500
+
+alert_queue: asyncio.Queue = asyncio.Queue()
+
+# Static alert template interpolated in one C-level format_map pass
+# instead of a dozen separate f-string concatenations per alert.
+_ALERT_TEMPLATE = (
+    "🚨 New Signal: {pair} ({timeframe}) 🚨\n\n"
+    "Direction: {direction}\n"
+    "Strategy: {strategy}\n"
+    "Entry: {entry:.5f}\n"
+    "Stop Loss: {stop:.5f}\n"
+    "Targets: {targets}\n"
+    "Confidence: {confidence:.2f}\n"
+    "Momentum: {momentum}\n"
+    "SLNO: {slno}\n"
+)
+
+def format_alert(signal_fields: dict) -> str:
+    # Takes the signal's model_dump() dict so callers serialize once and
+    # reuse the same dict for formatting, logging and caching.
+    fields = dict(signal_fields)
+    fields["targets"] = ", ".join(f"{t:.5f}" for t in fields["targets"])
+    fields["slno"] = fields.get("slno") or "N/A"
+    return _ALERT_TEMPLATE.format_map(fields)
+
+async def _send_with_retry(text: str):
+    # Exponential backoff (0.5 -> 1 -> 2 s) on transient network errors
+    # so a Telegram hiccup doesn't drop the alert or pin the event loop.
+    for attempt in range(3):
+        try:
+            await bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=text)
+            return
+        except (TimedOut, NetworkError) as e:
+            if attempt == 2:
+                raise
+            bot_logger.warning(f"Transient Telegram error (attempt {attempt + 1}/3): {e}")
+            await asyncio.sleep(0.5 * 2 ** attempt)
+
+async def _flusher():
+    while True:
+        batch = [await alert_queue.get()]
+        # Let a burst accumulate before shipping one combined message.
+        await asyncio.sleep(BATCH_FLUSH_INTERVAL)
+        total_chars = len(batch[0])
+        while total_chars < MAX_BUFFER_CHARS:
+            try:
+                message = alert_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            batch.append(message)
+            total_chars += len(message)
+        try:
+            await _send_with_retry("\n---\n".join(batch))
+            bot_logger.info(f"Sent batched alert ({len(batch)} signal(s))")
+        except Exception as e:
+            bot_logger.error(f"Failed to send batched alert: {e}")
+
+def start_alert_flusher() -> asyncio.Task:
+    return asyncio.create_task(_flusher())
+
 async def send_telegram_alert(signal: Signal):
-    message = (
-        f"🚨 New Signal: {signal.pair} ({signal.timeframe}) 🚨\n\n"
-        f"Direction: {signal.direction}\n"
-        f"Strategy: {signal.strategy}\n"
-        f"Entry: {signal.entry:.5f}\n"
-        f"Stop Loss: {signal.stop:.5f}\n"
-        f"Targets: {", ".join(f"{t:.5f}" for t in signal.targets)}\n"
-        f"Confidence: {signal.confidence:.2f}\n"
-        f"Momentum: {signal.momentum}\n"
-        f"SLNO: {signal.slno or 'N/A'}\n"
-    )
+    message = format_alert(signal.model_dump())
     bot_logger.info(f"Sending Telegram alert for {signal.pair}: {message}")
     try:
-        application = Application.builder().token(TELEGRAM_TOKEN).build()
-        await application.bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
+        await _send_with_retry(message)
         bot_logger.info(f"Telegram alert sent successfully for {signal.pair}")
     except Exception as e:
         bot_logger.error(f"Failed to send Telegram alert for {signal.pair}: {e}")
 
+_STATUS_ROW_TEMPLATE = (
+    "Pair: {pair}\n"
+    "Direction: {direction}\n"
+    "Entry Price: {entry}\n"
+    "SL: {stop}\n"
+    "TP List: {targets}\n"
+    "Momentum: {momentum}\n"
+    "SLNO: {slno}\n"
+    "---\n"
+)
+
 async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Sends a summary of all currently active trades."""
     cache: SignalCache = context.bot_data["signal_cache"]
@@ -52,27 +156,25 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await update.message.reply_text("No active trades at the moment.")
         return
 
-    response_message = "📊 Active Trades Summary 📊\n\n"
+    # Collect chunks and join once — a single exact-size allocation
+    # instead of repeated += string copies.
+    parts = ["📊 Active Trades Summary 📊\n\n"]
     for signal_data in active_signals:
-        response_message += (
-            f"Pair: {signal_data['pair']}\n"
-            f"Direction: {signal_data['direction']}\n"
-            f"Entry Price: {signal_data['entry']}\n"
-            f"SL: {signal_data['stop']}\n"
-            f"TP List: {', '.join(map(str, signal_data['targets']))}\n"
-            f"Momentum: {signal_data['momentum']}\n"
-            f"SLNO: {signal_data['slno'] or 'N/A'}\n"
-            f"---\n"
-        )
-    await update.message.reply_text(response_message)
+        row = dict(signal_data)
+        row["targets"] = ", ".join(map(str, signal_data["targets"]))
+        row["slno"] = signal_data["slno"] or "N/A"
+        parts.append(_STATUS_ROW_TEMPLATE.format_map(row))
+    await update.message.reply_text("".join(parts))
 
 def setup_telegram_bot(signal_cache: SignalCache):
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+    """Attach the signal cache and command handlers to the shared application.
+
+    Updates arrive via the /telegram webhook route in main.py, so no
+    getUpdates polling loop (or its dedicated connection pool) is needed.
+    """
     application.bot_data["signal_cache"] = signal_cache
     application.add_handler(CommandHandler("status", status_command))
-    application.run_polling(drop_pending_updates=True)
-    bot_logger.info("Telegram bot polling started.")
+    bot_logger.info("Telegram command handlers registered (webhook mode).")
+    return application
 
 
@@ -1,35 +1,100 @@
 import os
 import time
-import threading
 from fastapi import FastAPI, Request, HTTPException, Header
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, ValidationError
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from typing import List, Optional, Dict
 import uvicorn
-import pandas as pd
+import redis.asyncio as aioredis
 from dotenv import load_dotenv
 
-from crypto_signals_bot.src.bot import send_telegram_alert
+from telegram import Update
+
+from crypto_signals_bot.src.bot import (
+    alert_queue,
+    application,
+    format_alert,
+    setup_telegram_bot,
+    start_alert_flusher,
+)
 from crypto_signals_bot.src.strategies import validate_signal, Signal
 from signal_cache import SignalCache
 
 load_dotenv()
 
-app = FastAPI()
+# orjson (Rust SIMD parser) for all response serialization; request
+# bodies are parsed straight into the model below without a dict detour.
+app = FastAPI(default_response_class=ORJSONResponse)
 
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")
+PUBLIC_URL = os.getenv("PUBLIC_URL")
 
 if not TELEGRAM_TOKEN or not TELEGRAM_CHAT_ID or not WEBHOOK_SECRET:
     raise RuntimeError("Missing TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, or WEBHOOK_SECRET")
 
-rate_limit_lock = threading.Lock()
-last_alert_time: Dict[str, float] = {
-    "BTC/USDT": 0,
-    "ETH/USDT": 0,
-    "DOGE/USDT": 0,
-}
+# Rate limiting: with REDIS_URL set, a sorted-set rolling window shared
+# by all uvicorn workers, updated atomically by a Lua script (one EVALSHA
+# round-trip per check). Without Redis, fall back to the in-process dict,
+# which only limits correctly with a single worker.
+REDIS_URL = os.getenv("REDIS_URL")
+RATE_LIMIT_WINDOW_MS = 120_000
+RATE_LIMIT_MAX_ALERTS = 1
+
+_RATE_LIMIT_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1] - ARGV[2])
+local count = redis.call('ZCARD', KEYS[1])
+if count < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[1])
+    redis.call('EXPIRE', KEYS[1], math.ceil(ARGV[2] / 1000))
+    return 1
+end
+return 0
+"""
+_rate_limit_script = None
+_redis_client = None
+
+# Idempotent webhook deliveries: the runner stamps each post with an
+# X-Idempotency-Key; replays within the TTL are acknowledged without
+# re-processing. Redis (SET NX EX) makes this work across workers; the
+# in-process dict fallback has the same single-worker caveat as the
+# rate limiter above.
+IDEMPOTENCY_TTL_S = 86_400
+_seen_idempotency_keys: Dict[str, float] = {}
+
+last_alert_time: Dict[str, float] = {}
+
+setup_telegram_bot(SignalCache())
+
+@app.on_event("startup")
+async def startup_event():
+    # Initialize the shared Telegram application so its httpx client
+    # (and connection pool) lives for the whole process.
+    await application.initialize()
+    await application.start()
+    if PUBLIC_URL:
+        await application.bot.set_webhook(url=f"{PUBLIC_URL}/telegram/{WEBHOOK_SECRET}")
+    app.state.alert_flusher = start_alert_flusher()
+    if REDIS_URL:
+        global _rate_limit_script, _redis_client
+        _redis_client = aioredis.from_url(REDIS_URL)
+        _rate_limit_script = _redis_client.register_script(_RATE_LIMIT_LUA)
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    app.state.alert_flusher.cancel()
+    await application.stop()
+    await application.shutdown()
+
+@app.post("/telegram/{secret}")
+async def telegram_webhook(secret: str, request: Request):
+    """Receive Telegram updates via webhook instead of getUpdates polling."""
+    if secret != WEBHOOK_SECRET:
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    update = Update.de_json(await request.json(), application.bot)
+    await application.update_queue.put(update)
+    return ORJSONResponse(content={"ok": True})
 
 class WebhookSignal(BaseModel):
     pair: str
@@ -46,45 +111,88 @@ class WebhookSignal(BaseModel):
     strategy_invalidated: Optional[bool] = False
     exit_reason: Optional[str] = None
 
+# Compile the webhook validator once at import; each request then goes
+# straight to the prebuilt pydantic-core validator.
+_WEBHOOK_ADAPTER = TypeAdapter(WebhookSignal)
+
+async def _is_duplicate_delivery(key: str) -> bool:
+    if _redis_client is not None:
+        # SET NX EX: returns truthy only when the key was newly stored.
+        return not await _redis_client.set(f"idem:{key}", 1, nx=True, ex=IDEMPOTENCY_TTL_S)
+    now = time.time()
+    cutoff = now - IDEMPOTENCY_TTL_S
+    if len(_seen_idempotency_keys) > 4096:
+        for k, t in list(_seen_idempotency_keys.items()):
+            if t < cutoff:
+                del _seen_idempotency_keys[k]
+    if _seen_idempotency_keys.get(key, 0.0) > cutoff:
+        return True
+    _seen_idempotency_keys[key] = now
+    return False
+
 @app.post("/webhook")
-async def webhook(request: Request, x_webhook_secret: Optional[str] = Header(None, alias="X-Webhook-Secret")):
+async def webhook(request: Request,
+                  x_webhook_secret: Optional[str] = Header(None, alias="X-Webhook-Secret"),
+                  x_idempotency_key: Optional[str] = Header(None, alias="X-Idempotency-Key")):
     if x_webhook_secret != WEBHOOK_SECRET:
         raise HTTPException(status_code=401, detail="Unauthorized: Invalid webhook secret")
 
-    try:
-        payload = await request.json()
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    if x_idempotency_key and await _is_duplicate_delivery(x_idempotency_key):
+        return ORJSONResponse(content={"message": "Duplicate delivery ignored"}, status_code=200)
 
     try:
-        webhook_signal = WebhookSignal(**payload)
+        # Validate straight from the raw bytes — pydantic-core parses the
+        # JSON itself, skipping the intermediate dict round-trip.
+        webhook_signal = _WEBHOOK_ADAPTER.validate_json(await request.body())
         signal = Signal(**webhook_signal.dict())
     except ValidationError as e:
         raise HTTPException(status_code=400, detail=f"Signal validation error: {e}")
 
-    # The validate_signal function in strategies.py expects a DataFrame, but the webhook payload doesn\"t contain it.
-    # For now, we\"ll pass a dummy DataFrame to avoid errors, but this needs to be addressed if validation logic relies on it.
-    # A better solution would be to refactor validate_signal to not require a DataFrame, or to fetch data within the webhook if necessary.
-    dummy_df = pd.DataFrame()
-    validated = validate_signal(signal, dummy_df)
+    # validate_signal's DataFrame argument is optional; the webhook payload
+    # carries no market data, so skip it — the field checks don't need it.
+    validated = validate_signal(signal)
     if not validated:
         raise HTTPException(status_code=400, detail="Signal failed validation")
 
-    if can_send_alert(signal.pair):
-        try:
-            await send_telegram_alert(signal)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Telegram error: {str(e)}")
+    # Serialize once — format_alert (and any later consumers) reuse this
+    # dict instead of re-walking the pydantic schema per use.
+    dump = validated.model_dump()
+
+    if await can_send_alert(signal.pair):
+        alert_queue.put_nowait(format_alert(dump))
 
-    return JSONResponse(content={"message": "✅ Signal processed"}, status_code=200)
+    return ORJSONResponse(content={"message": "✅ Signal processed"}, status_code=200)
 
-def can_send_alert(pair: str) -> bool:
-    with rate_limit_lock:
-        now = time.time()
-        if now - last_alert_time.get(pair, 0) >= 120:
-            last_alert_time[pair] = now
-            return True
-        return False
+async def can_send_alert(pair: str) -> bool:
+    if _rate_limit_script is not None:
+        now_ms = int(time.time() * 1000)
+        allowed = await _rate_limit_script(
+            keys=[f"rl:{pair}"],
+            args=[now_ms, RATE_LIMIT_WINDOW_MS, RATE_LIMIT_MAX_ALERTS],
+        )
+        return bool(allowed)
+    # Lock-free: dict reads and item assignment are atomic under the GIL,
+    # so the hot path is a single get + monotonic-clock compare with no
+    # critical section serializing concurrent webhooks.
+    now = time.monotonic()
+    if now - last_alert_time.get(pair, 0.0) >= 120:
+        last_alert_time[pair] = now
+        return True
+    return False
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
+    # uvloop (libuv) + httptools (C parser) replace the stdlib selector
+    # loop and Python-level HTTP parsing on the request hot path.
+    # Auto-reload (file watcher + double import, single worker) only in
+    # dev; production scales across cores via WEB_CONCURRENCY.
+    if os.getenv("DEV"):
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True, loop="uvloop", http="httptools")
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="uvloop",
+            http="httptools",
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 2)),
+        )
@@ -1,20 +1,139 @@
-from typing import Optional, List, Tuple
+import sys
+from collections import deque
+from dataclasses import dataclass, field, fields as dataclass_fields
+from typing import Dict, Optional, List, Tuple
+import numpy as np
 import pandas as pd
-from pydantic import BaseModel, Field, ConfigDict
-from ta.trend import EMAIndicator
-from ta.volatility import BollingerBands, AverageTrueRange
-from ta.momentum import RSIIndicator
-from ta.volume import VolumeWeightedAveragePrice
 import logging
 
-# Configure logging
+from crypto_signals_bot.src._numba_kernels import (
+    atr_last,
+    ema9_21_tail,
+    ema9_21_tail_2d,
+    find_last_two_pivots_high,
+    find_last_two_pivots_low,
+)
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+# Configure logging: queue + background listener keeps file I/O off the
+# strategy evaluation path.
 strategy_logger = logging.getLogger("strategies")
 strategy_logger.setLevel(logging.INFO)
-handler = logging.FileHandler("strategies.log")
-handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
-strategy_logger.addHandler(handler)
+_log_queue: queue.Queue = queue.Queue(-1)
+strategy_logger.addHandler(QueueHandler(_log_queue))
+_file_handler = logging.FileHandler("strategies.log", delay=True)
+_file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+_log_listener = QueueListener(_log_queue, _file_handler)
+_log_listener.start()
+
+# Direct indicator primitives: the ta wrapper classes rebuild and
+# validate full Series per call only for us to read the last one or two
+# values, so the strategies below compute the same math straight from
+# pandas/NumPy.
+def _rsi(close: pd.Series, window: int = 14) -> pd.Series:
+    """Wilder-smoothed RSI computed from close deltas."""
+    delta = close.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / window, adjust=False).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / window, adjust=False).mean()
+    rs = gain / loss
+    return 100 - 100 / (1 + rs)
+
+def _vwap_tail(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+               vol: np.ndarray, window: int = 20) -> Tuple:
+    """Last two rolling-VWAP values from one tail slice.
+
+    The breakout check only consumes vwap[-2] and vwap[-1], so this sums
+    a (window+1)-bar tail instead of materializing typical-price and two
+    rolling-sum Series over the whole history. Works on 1D arrays (scalar
+    results) and on (n_bars, n_pairs) stacks (per-column results); bars
+    short of a full window yield NaN, matching rolling(window).
+    """
+    n = close.shape[0]
+    cols = close.shape[1:]
+    nan = np.full(cols, np.nan) if cols else float("nan")
+    if n < window:
+        return nan, nan
+    k = window + 1
+    num = (high[-k:] + low[-k:] + close[-k:]) / 3.0 * vol[-k:]
+    v = vol[-k:]
+    last = num[-window:].sum(axis=0) / v[-window:].sum(axis=0)
+    if n < k:
+        return nan, last
+    prev = num[:window].sum(axis=0) / v[:window].sum(axis=0)
+    return prev, last
+
+def _shared_indicators(df: pd.DataFrame) -> dict:
+    """Compute the columns and indicators shared by several strategies once.
+
+    calculate_all_strategies builds this dict per evaluation and passes it
+    to every strategy, so nothing (raw arrays, EMAs, RSI, VWAP, Bollinger
+    stats, the 20-bar average volume) is recomputed five times over.
+    """
+    close_s = df["close"]
+    close = close_s.to_numpy(dtype=np.float64)
+    high = df["high"].to_numpy()
+    low = df["low"].to_numpy()
+    vol = df["volume"].to_numpy()
+    # One fused pass over close for both EMAs; the crossover only reads
+    # the last three values of each, so just the tails are kept.
+    e9_2, e9_1, e9_0, e21_2, e21_1, e21_0 = ema9_21_tail(close)
+    return {
+        "close": close,
+        "high": high,
+        "low": low,
+        "vol": vol,
+        "avg_vol_20": float(vol[-20:].mean()),
+        "ema9": (e9_2, e9_1, e9_0),
+        "ema21": (e21_2, e21_1, e21_0),
+        "rsi14": _rsi(close_s, 14).to_numpy(),
+        "bb_mavg": close_s.rolling(20).mean(),
+        "bb_std": close_s.rolling(20).std(ddof=0),
+    }
+
+def _shared_atr(shared: dict) -> float:
+    """ATR(14) memoized on the shared dict.
+
+    Computed lazily — only evaluations where a strategy actually fires
+    pay for it — and at most once per evaluation even when several
+    strategies fire.
+    """
+    atr = shared.get("atr14")
+    if atr is None:
+        atr = shared["atr14"] = atr_last(shared["high"], shared["low"], shared["close"], 14)
+    return atr
+
+# Precomputed risk-reward multiples; _targets vectorizes the three
+# price+multiple*risk rounds into one NumPy operation.
+_RR_MULTS = np.array([1.0, 2.0, 3.0])
+
+def _targets(price: float, risk: float, sign: float) -> List[float]:
+    return np.round(price + sign * _RR_MULTS * risk, 2).tolist()
+
+# Immutable lookup tables; interned members make the common membership
+# hit a pointer-equality comparison.
+VALID_PAIRS = frozenset(sys.intern(s) for s in ("BTC/USDT", "ETH/USDT", "DOGE/USDT"))
+VALID_TIMEFRAMES = frozenset(sys.intern(s) for s in ("3m", "5m", "15m"))
+VALID_STRATEGIES = frozenset(sys.intern(s) for s in (
+    "VWAP Breakout",
+    "EMA Cross",
+    "RSI Divergence",
+    "Support/Resistance Break",
+    "Bollinger Band Squeeze",
+))
+VALID_MOMENTUM = frozenset(sys.intern(s) for s in ("LOW", "MEDIUM", "HIGH"))
+VALID_DIRECTIONS = frozenset(sys.intern(s) for s in ("BUY", "SELL"))
+MIN_CONFIDENCE = 0.6
+
+@dataclass(slots=True)
+class Signal:
+    """Trade signal produced by the strategy evaluators.
 
-class Signal(BaseModel):
+    A plain slotted dataclass instead of a pydantic model: signals are
+    built per strategy per bar, where pydantic's per-field validation is
+    pure overhead — the webhook already validates inbound payloads via
+    WebhookSignal, and validate_signal covers the business rules.
+    """
     pair: str
     direction: str  # "BUY" or "SELL"
     strategy: str
@@ -29,18 +148,46 @@ class Signal(BaseModel):
     strategy_invalidated: bool = False
     exit_reason: Optional[str] = None
     slno: Optional[str] = None
-    
-    model_config = ConfigDict(
-        arbitrary_types_allowed=True,
-        extra="ignore"
-    )
+    # Scalar tail snapshot for exit monitoring — the only values
+    # detect_momentum_change needs, so open signals cost O(1) memory
+    # instead of retaining the whole OHLCV frame.
+    last_close: Optional[float] = None
+    prev_close: Optional[float] = None
+    last_volume: Optional[float] = None
+    prev_volume: Optional[float] = None
+
+    def __post_init__(self):
+        # Strategies hand in NumPy scalars; normalize to builtin floats so
+        # json serialization of cached/forwarded signals keeps working.
+        self.entry = float(self.entry)
+        self.stop = float(self.stop)
+        self.confidence = float(self.confidence)
+        self.targets = [float(t) for t in self.targets]
+
+    def to_dict(self, exclude: Optional[set] = None) -> dict:
+        d = {f.name: getattr(self, f.name) for f in dataclass_fields(self)}
+        if exclude:
+            for key in exclude:
+                d.pop(key, None)
+        return d
+
+    # Aliases keeping the pydantic-era call sites (.dict() / .model_dump())
+    # working unchanged.
+    def dict(self, exclude: Optional[set] = None) -> dict:
+        return self.to_dict(exclude)
+
+    def model_dump(self, exclude: Optional[set] = None) -> dict:
+        return self.to_dict(exclude)
 
-def check_trend_reversal(signal: Signal, df: pd.DataFrame) -> bool:
+def check_trend_reversal(signal: Signal, df: pd.DataFrame, shared: Optional[dict] = None) -> bool:
     """Check for trend reversal conditions"""
-    if df.empty or "close" not in df.columns:
-        return False # Cannot perform check without data
-    ema9 = EMAIndicator(df["close"], window=9).ema_indicator().iloc[-1]
-    ema21 = EMAIndicator(df["close"], window=21).ema_indicator().iloc[-1]
+    if shared is not None:
+        ema9 = shared["ema9"][-1]
+        ema21 = shared["ema21"][-1]
+    else:
+        if df.empty or "close" not in df.columns:
+            return False # Cannot perform check without data
+        _, _, ema9, _, _, ema21 = ema9_21_tail(df["close"].to_numpy(dtype=np.float64))
     
     if signal.direction == "BUY" and ema9 < ema21:
         strategy_logger.warning(f"Trend reversal detected for {signal.pair} {signal.strategy}")
@@ -50,11 +197,14 @@ def check_trend_reversal(signal: Signal, df: pd.DataFrame) -> bool:
         return True
     return False
 
-def check_momentum_crash(signal: Signal, df: pd.DataFrame) -> bool:
+def check_momentum_crash(signal: Signal, df: pd.DataFrame, shared: Optional[dict] = None) -> bool:
     """Check for momentum crash conditions"""
-    if df.empty or "close" not in df.columns:
-        return False # Cannot perform check without data
-    rsi = RSIIndicator(df["close"], window=14).rsi().iloc[-1]
+    if shared is not None:
+        rsi = shared["rsi14"][-1]
+    else:
+        if df.empty or "close" not in df.columns:
+            return False # Cannot perform check without data
+        rsi = _rsi(df["close"], 14).iloc[-1]
     
     if signal.direction == "BUY" and rsi < 45:
         strategy_logger.warning(f"Momentum crash (RSI={rsi:.1f}) for {signal.pair}")
@@ -64,22 +214,21 @@ def check_momentum_crash(signal: Signal, df: pd.DataFrame) -> bool:
         return True
     return False
 
-def check_vwap_rejection(signal: Signal, df: pd.DataFrame) -> bool:
+def check_vwap_rejection(signal: Signal, df: pd.DataFrame, shared: Optional[dict] = None) -> bool:
     """Check for VWAP rejection (for VWAP strategy only)"""
-    if df.empty or "close" not in df.columns or "high" not in df.columns or "low" not in df.columns or "volume" not in df.columns:
-        return False # Cannot perform check without data
     if signal.strategy != "VWAP Breakout":
         return False
-        
-    vwap = VolumeWeightedAveragePrice(
-        high=df["high"],
-        low=df["low"],
-        close=df["close"],
-        volume=df["volume"],
-        window=20
-    ).volume_weighted_average_price().iloc[-1]
-    
-    current_price = df["close"].iloc[-1]
+    if shared is not None:
+        close = shared["close"]
+        _, vwap = _vwap_tail(shared["high"], shared["low"], close, shared["vol"])
+    else:
+        if df.empty or "close" not in df.columns or "high" not in df.columns or "low" not in df.columns or "volume" not in df.columns:
+            return False # Cannot perform check without data
+        close = df["close"].to_numpy()
+        _, vwap = _vwap_tail(df["high"].to_numpy(), df["low"].to_numpy(), close,
+                             df["volume"].to_numpy())
+
+    current_price = close[-1]
     
     if signal.direction == "BUY" and current_price < vwap:
         strategy_logger.warning(f"VWAP rejection for {signal.pair}")
@@ -89,358 +238,642 @@ def check_vwap_rejection(signal: Signal, df: pd.DataFrame) -> bool:
         return True
     return False
 
-def validate_signal(signal: Signal, df: Optional[pd.DataFrame] = None) -> Optional[Signal]:
+def validate_signal(signal: Signal, df: Optional[pd.DataFrame] = None,
+                    shared: Optional[dict] = None) -> Optional[Signal]:
     """Enhanced signal validation with safety checks"""
-    if signal.confidence < 0.6:
-        strategy_logger.info(f"Signal rejected: Confidence {signal.confidence} < 0.6")
-        return None
-    if len(signal.targets) != 3:
-        strategy_logger.info(f"Signal rejected: Invalid targets count {len(signal.targets)}")
-        return None
-    if signal.direction not in ["BUY", "SELL"]:
-        strategy_logger.info(f"Signal rejected: Invalid direction {signal.direction}")
-        return None
-    if signal.entry <= 0 or signal.stop <= 0:
-        strategy_logger.info(f"Signal rejected: Invalid entry/stop {signal.entry}/{signal.stop}")
+    # One short-circuited expression, ordered cheapest and most-rejecting
+    # first, so the common reject paths exit after a single comparison.
+    if (signal.confidence < MIN_CONFIDENCE
+            or signal.pair not in VALID_PAIRS
+            or signal.direction not in VALID_DIRECTIONS
+            or signal.timeframe not in VALID_TIMEFRAMES
+            or signal.strategy not in VALID_STRATEGIES
+            or signal.momentum not in VALID_MOMENTUM
+            or len(signal.targets) != 3
+            or signal.entry <= 0
+            or signal.stop <= 0):
+        strategy_logger.info(
+            f"Signal rejected: {signal.pair} {signal.strategy} {signal.direction} "
+            f"{signal.timeframe} conf={signal.confidence} failed fast checks"
+        )
         return None
         
-    # Apply safety checks only if DataFrame is provided and not empty
-    if df is not None and not df.empty:
-        if check_trend_reversal(signal, df):
+    # Apply safety checks when market data is available. With a shared
+    # dict the checks read the already-hoisted tails; the DataFrame path
+    # re-derives them for external callers.
+    if shared is not None or (df is not None and not df.empty):
+        if check_trend_reversal(signal, df, shared):
             signal.early_exit = True
             signal.strategy_invalidated = True
             signal.exit_reason = "TREND_REVERSAL"
             
-        if check_momentum_crash(signal, df):
+        if check_momentum_crash(signal, df, shared):
             signal.early_exit = True
             signal.momentum_change = "LOW"
             signal.exit_reason = "MOMENTUM_CRASH"
             
-        if check_vwap_rejection(signal, df):
+        if check_vwap_rejection(signal, df, shared):
             signal.early_exit = True
             signal.strategy_invalidated = True
             signal.exit_reason = "VWAP_REJECTION"
         
     return signal
 
-def calculate_vwap_breakout(df: pd.DataFrame, pair: str, timeframe: str) -> Optional[Signal]:
+def _directional_signal(pair: str, strategy: str, timeframe: str, price: float,
+                        sign: float, atr: float, **fields) -> Signal:
+    """Build a Signal for either direction from its sign (+1 BUY, -1 SELL).
+
+    Direction, stop and targets are all sign-symmetric, so the paired
+    BUY/SELL bodies in each strategy collapse to one call; strategy-
+    specific fields (confidence, momentum) pass through as keywords.
+    """
+    return Signal(
+        pair=pair,
+        direction="BUY" if sign > 0 else "SELL",
+        strategy=strategy,
+        timeframe=timeframe,
+        entry=price,
+        stop=round(price - sign * atr, 2),
+        targets=_targets(price, atr, sign),
+        **fields,
+    )
+
+def calculate_vwap_breakout(df: pd.DataFrame, pair: str, timeframe: str, shared: Optional[dict] = None) -> Optional[Signal]:
     """VWAP Breakout with volume confirmation"""
-    vwap = VolumeWeightedAveragePrice(
-        high=df["high"],
-        low=df["low"],
-        close=df["close"],
-        volume=df["volume"],
-        window=20
-    ).volume_weighted_average_price()
-    
-    current_price = df["close"].iloc[-1]
-    prev_price = df["close"].iloc[-2]
-    current_volume = df["volume"].iloc[-1]
-    avg_volume = df["volume"].rolling(20).mean().iloc[-1]
-    
-    # Breakout conditions
-    bullish = (prev_price < vwap.iloc[-2]) and (current_price > vwap.iloc[-1])
-    bearish = (prev_price > vwap.iloc[-2]) and (current_price < vwap.iloc[-1])
+    if shared is None:
+        shared = _shared_indicators(df)
+    close = shared["close"]
+    vol = shared["vol"]
+
+    current_price = close[-1]
+    prev_price = close[-2]
+    current_volume = vol[-1]
+    avg_volume = shared["avg_vol_20"]
+
+    # Volume gate first: both breakout branches require it, and most bars
+    # fail it, so the VWAP tail sums are skipped entirely on those bars.
     vol_confirmed = current_volume > avg_volume * 1.5
-    
-    if bullish and vol_confirmed:
-        atr = _calculate_atr(df)
-        stop = round(current_price - atr, 2)
-        targets = [round(current_price + r * atr, 2) for r in [1, 2, 3]]
-        signal = Signal(
-            pair=pair,
-            direction="BUY",
-            strategy="VWAP Breakout",
-            timeframe=timeframe,
-            entry=current_price,
-            stop=stop,
-            targets=targets,
-            confidence=min(0.75 + (current_volume/avg_volume - 1.5)/3, 0.95),
-            momentum="HIGH" if current_volume > avg_volume * 2 else "MEDIUM",
-        )
-        return validate_signal(signal, df)
-    
-    elif bearish and vol_confirmed:
-        atr = _calculate_atr(df)
-        stop = round(current_price + atr, 2)
-        targets = [round(current_price - r * atr, 2) for r in [1, 2, 3]]
-        signal = Signal(
-            pair=pair,
-            direction="SELL",
-            strategy="VWAP Breakout",
-            timeframe=timeframe,
-            entry=current_price,
-            stop=stop,
-            targets=targets,
-            confidence=min(0.75 + (current_volume/avg_volume - 1.5)/3, 0.95),
-            momentum="HIGH" if current_volume > avg_volume * 2 else "MEDIUM",
-        )
-        return validate_signal(signal, df)    
+    if not vol_confirmed:
+        strategy_logger.info(f"VWAP Breakout: No valid signal for {pair} {timeframe}")
+        return None
+
+    vwap = _vwap_tail(shared["high"], shared["low"], close, vol)
+
+    # Breakout conditions: a crossing of the VWAP in either direction,
+    # collapsed to the sign of the move.
+    for sign in (1.0, -1.0):
+        if sign * (prev_price - vwap[-2]) < 0 and sign * (current_price - vwap[-1]) > 0:
+            signal = _directional_signal(
+                pair, "VWAP Breakout", timeframe, current_price, sign,
+                _shared_atr(shared),
+                confidence=min(0.75 + (current_volume/avg_volume - 1.5)/3, 0.95),
+                momentum="HIGH" if current_volume > avg_volume * 2 else "MEDIUM",
+            )
+            return validate_signal(signal, df, shared)
     strategy_logger.info(f"VWAP Breakout: No valid signal for {pair} {timeframe}")
     return None
 
-def calculate_ema_cross(df: pd.DataFrame, pair: str, timeframe: str) -> Optional[Signal]:
+def calculate_ema_cross(df: pd.DataFrame, pair: str, timeframe: str, shared: Optional[dict] = None) -> Optional[Signal]:
     """EMA 9/21 Crossover Strategy"""
-    ema9 = EMAIndicator(close=df["close"], window=9).ema_indicator()
-    ema21 = EMAIndicator(close=df["close"], window=21).ema_indicator()
-    
-    current_price = df["close"].iloc[-1]
-    bullish = (ema9.iloc[-2] <= ema21.iloc[-2]) and (ema9.iloc[-1] > ema21.iloc[-1])
-    bearish = (ema9.iloc[-2] >= ema21.iloc[-2]) and (ema9.iloc[-1] < ema21.iloc[-1])
-    
-    if bullish:
-        atr = _calculate_atr(df)
-        stop = round(current_price - atr, 2)
-        targets = [round(current_price + r * atr, 2) for r in [1, 2, 3]]
-        angle = (ema9.iloc[-1] - ema9.iloc[-3]) / (ema9.iloc[-3] or 1)
-        signal = Signal(
-            pair=pair,
-            direction="BUY",
-            strategy="EMA Cross",
-            timeframe=timeframe,
-            entry=current_price,
-            stop=stop,
-            targets=targets,
-            confidence=min(0.65 + angle*100, 0.90),
-            momentum="HIGH" if angle > 0.01 else "MEDIUM",
-        )
-        return validate_signal(signal, df)
-    
-    elif bearish:
-        atr = _calculate_atr(df)
-        stop = round(current_price + atr, 2)
-        targets = [round(current_price - r * atr, 2) for r in [1, 2, 3]]
-        angle = (ema9.iloc[-3] - ema9.iloc[-1]) / (ema9.iloc[-3] or 1)
-        signal = Signal(
-            pair=pair,
-            direction="SELL",
-            strategy="EMA Cross",
-            timeframe=timeframe,
-            entry=current_price,
-            stop=stop,
-            targets=targets,
-            confidence=min(0.65 + angle*100, 0.90),
-            momentum="HIGH" if angle > 0.01 else "MEDIUM",
-        )
-        return validate_signal(signal, df)
-    
+    if shared is None:
+        shared = _shared_indicators(df)
+    close = shared["close"]
+
+    # Flat-candle pre-check: with no last-bar price change the smoothed
+    # EMAs can't have just crossed, so skip the evaluation outright.
+    if abs(close[-1] - close[-2]) / close[-2] < 1e-5:
+        strategy_logger.info(f"EMA Cross: No valid signal for {pair} {timeframe}")
+        return None
+
+    ema9 = shared["ema9"]
+    ema21 = shared["ema21"]
+
+    current_price = close[-1]
+    # Crossover in either direction: the fast EMA was on or below the slow
+    # one and is now on the other side, with the inequalities flipped by
+    # the sign; the slope "angle" flips with it.
+    for sign in (1.0, -1.0):
+        if sign * (ema9[-2] - ema21[-2]) <= 0 and sign * (ema9[-1] - ema21[-1]) > 0:
+            angle = sign * (ema9[-1] - ema9[-3]) / (ema9[-3] or 1)
+            signal = _directional_signal(
+                pair, "EMA Cross", timeframe, current_price, sign,
+                _shared_atr(shared),
+                confidence=min(0.65 + angle*100, 0.90),
+                momentum="HIGH" if angle > 0.01 else "MEDIUM",
+            )
+            return validate_signal(signal, df, shared)
     strategy_logger.info(f"EMA Cross: No valid signal for {pair} {timeframe}")
     return None
 
-def calculate_rsi_divergence(df: pd.DataFrame, pair: str, timeframe: str) -> Optional[Signal]:
+def calculate_rsi_divergence(df: pd.DataFrame, pair: str, timeframe: str, shared: Optional[dict] = None) -> Optional[Signal]:
     """RSI Divergence Detection"""
-    rsi = RSIIndicator(close=df["close"], window=14).rsi()
-    current_rsi = rsi.iloc[-1]
-    
+    if shared is None:
+        shared = _shared_indicators(df)
+    close = shared["close"]
+    rsi_arr = shared["rsi14"]
+    current_rsi = rsi_arr[-1]
+
     if len(df) < 15:
         strategy_logger.info(f"RSI Divergence: Not enough data for {pair} {timeframe}")
         return None
-    
-    # Bullish divergence detection
-    lows = df["low"].rolling(5, center=True).min() == df["low"]
-    if sum(lows[-10:]) >= 2:
-        idx = lows[lows].index[-2:]
-        price_low1, price_low2 = df["low"].loc[idx[0]], df["low"].loc[idx[1]]
-        rsi_low1, rsi_low2 = rsi.loc[idx[0]], rsi.loc[idx[1]]
-        
-        if (price_low2 < price_low1) and (rsi_low2 > rsi_low1) and (current_rsi > 30):
-            current_price = df["close"].iloc[-1]
-            atr = _calculate_atr(df)
-            stop = round(current_price - atr, 2)
-            targets = [round(current_price + r * atr, 2) for r in [1, 2, 3]]
-            signal = Signal(
-                pair=pair,
-                direction="BUY",
-                strategy="RSI Divergence",
-                timeframe=timeframe,
-                entry=current_price,
-                stop=stop,
-                targets=targets,
-                confidence=min(0.70 + (rsi_low2 - rsi_low1)/10, 0.85),
-                momentum="HIGH" if current_rsi > 50 else "MEDIUM",
-            )
-            return validate_signal(signal, df)
-    
-    # Bearish divergence detection
-    highs = df["high"].rolling(5, center=True).max() == df["high"]
-    if sum(highs[-10:]) >= 2:
-        idx = highs[highs].index[-2:]
-        price_high1, price_high2 = df["high"].loc[idx[0]], df["high"].loc[idx[1]]
-        rsi_high1, rsi_high2 = rsi.loc[idx[0]], rsi.loc[idx[1]]
-        
-        if (price_high2 > price_high1) and (rsi_high2 < rsi_high1) and (current_rsi < 70):
-            current_price = df["close"].iloc[-1]
-            atr = _calculate_atr(df)
-            stop = round(current_price + atr, 2)
-            targets = [round(current_price - r * atr, 2) for r in [1, 2, 3]]
-            signal = Signal(
-                pair=pair,
-                direction="SELL",
-                strategy="RSI Divergence",
-                timeframe=timeframe,
-                entry=current_price,
-                stop=stop,
-                targets=targets,
-                confidence=min(0.70 + (rsi_high1 - rsi_high2)/10, 0.85),
-                momentum="HIGH" if current_rsi < 50 else "MEDIUM",
+
+    low = shared["low"]
+    high = shared["high"]
+
+    # Divergence detection — the jitted backward scan returns the
+    # positions of the last two pivots plus the recent pivot count. The
+    # bullish (low pivots) and bearish (high pivots) cases are mirror
+    # images, so both run through one sign-parameterized body: price made
+    # a more extreme pivot, RSI did not confirm it, and the current RSI
+    # sits inside the 30/70 band on the signal's side.
+    for finder, series, sign in ((find_last_two_pivots_low, low, 1.0),
+                                 (find_last_two_pivots_high, high, -1.0)):
+        i1, i2, recent = finder(series)
+        if recent < 2:
+            continue
+        price1, price2 = series[i1], series[i2]
+        rsi1, rsi2 = rsi_arr[i1], rsi_arr[i2]
+
+        if (sign * (price2 - price1) < 0 and sign * (rsi2 - rsi1) > 0
+                and sign * (current_rsi - 50) > -20):
+            current_price = close[-1]
+            signal = _directional_signal(
+                pair, "RSI Divergence", timeframe, current_price, sign,
+                _shared_atr(shared),
+                confidence=min(0.70 + sign * (rsi2 - rsi1)/10, 0.85),
+                momentum="HIGH" if sign * (current_rsi - 50) > 0 else "MEDIUM",
             )
-            return validate_signal(signal, df)
-    
+            return validate_signal(signal, df, shared)
+
     strategy_logger.info(f"RSI Divergence: No valid signal for {pair} {timeframe}")
     return None
 
-def calculate_support_resistance_break(df: pd.DataFrame, pair: str, timeframe: str) -> Optional[Signal]:
+def calculate_support_resistance_break(df: pd.DataFrame, pair: str, timeframe: str, shared: Optional[dict] = None) -> Optional[Signal]:
     """Support/Resistance Breakout Strategy"""
-    current_price = df["close"].iloc[-1]
-    current_volume = df["volume"].iloc[-1]
-    avg_volume = df["volume"].rolling(20).mean().iloc[-1]
-    
-    # Identify key levels
+    if shared is None:
+        shared = _shared_indicators(df)
+    close = shared["close"]
+    high = shared["high"]
+    low = shared["low"]
+    vol = shared["vol"]
+
+    current_price = close[-1]
+    current_volume = vol[-1]
+    avg_volume = shared["avg_vol_20"]
+
+    # Volume gate first: both breakout branches require it, so the level
+    # and touch-count reductions only run on volume-confirmed bars.
+    if not current_volume > avg_volume * 1.2:
+        strategy_logger.info(f"Support/Resistance Break: No valid signal for {pair} {timeframe}")
+        return None
+
+    # Identify key levels — only the last rolling max/min is used, so
+    # reduce the tail slice directly.
     pivot_range = 8
-    resistance = df["high"].rolling(pivot_range).max().iloc[-1]
-    support = df["low"].rolling(pivot_range).min().iloc[-1]
-    
-    # Breakout conditions
-    res_touches = sum(df["high"][-15:] >= resistance * 0.995)
-    sup_touches = sum(df["low"][-15:] <= support * 1.005)
-    
-    # Bullish breakout
-    if (res_touches >= 2 and current_price > resistance 
-        and df["close"].iloc[-2] <= resistance and current_volume > avg_volume * 1.2):
-        atr = _calculate_atr(df)
-        stop = round(current_price - atr, 2)
-        targets = [round(current_price + r * atr, 2) for r in [1, 2, 3]]
-        signal = Signal(
-            pair=pair,
-            direction="BUY",
-            strategy="Support/Resistance Break",
-            timeframe=timeframe,
-            entry=current_price,
-            stop=stop,
-            targets=targets,
-            momentum="HIGH" if current_volume > avg_volume * 1.5 else "MEDIUM",
-        )
-        return validate_signal(signal, df)
-    
-    # Bearish breakout
-    elif (sup_touches >= 2 and current_price < support 
-          and df["close"].iloc[-2] >= support and current_volume > avg_volume * 1.2):
-        atr = _calculate_atr(df)
-        stop = round(current_price + atr, 2)
-        targets = [round(current_price - r * atr, 2) for r in [1, 2, 3]]
-        signal = Signal(
-            pair=pair,
-            direction="SELL",
-            strategy="Support/Resistance Break",
-            timeframe=timeframe,
-            entry=current_price,
-            stop=stop,
-            targets=targets,
-            momentum="HIGH" if current_volume > avg_volume * 1.5 else "MEDIUM",
-        )
-        return validate_signal(signal, df)
+    resistance = high[-pivot_range:].max()
+    support = low[-pivot_range:].min()
+
+    # Breakout conditions: one C-level reduction each instead of a
+    # Python-level sum() boxing 15 pandas scalars.
+    res_touches = int(np.count_nonzero(high[-15:] >= resistance * 0.995))
+    sup_touches = int(np.count_nonzero(low[-15:] <= support * 1.005))
     
+    # Breakout in either direction: enough touches on the level, the
+    # previous close still on the inside and the current close beyond it
+    # — the bullish (resistance) and bearish (support) inequalities are
+    # the same comparison under the direction sign.
+    for level, touches, sign in ((resistance, res_touches, 1.0),
+                                 (support, sup_touches, -1.0)):
+        if (touches >= 2 and sign * (current_price - level) > 0
+                and sign * (close[-2] - level) <= 0):
+            signal = _directional_signal(
+                pair, "Support/Resistance Break", timeframe, current_price,
+                sign, _shared_atr(shared),
+                momentum="HIGH" if current_volume > avg_volume * 1.5 else "MEDIUM",
+            )
+            return validate_signal(signal, df, shared)
+
     strategy_logger.info(f"Support/Resistance Break: No valid signal for {pair} {timeframe}")
     return None
 
-def calculate_bollinger_squeeze(df: pd.DataFrame, pair: str, timeframe: str) -> Optional[Signal]:
+def calculate_bollinger_squeeze(df: pd.DataFrame, pair: str, timeframe: str, shared: Optional[dict] = None) -> Optional[Signal]:
     """Bollinger Band Squeeze Breakout"""
-    bb = BollingerBands(close=df["close"], window=20, window_dev=2)
-    upper = bb.bollinger_hband()
-    lower = bb.bollinger_lband()
-    bandwidth = (upper - lower) / bb.bollinger_mavg()
-    
-    current_price = df["close"].iloc[-1]
-    prev_price = df["close"].iloc[-2]
-    current_volume = df["volume"].iloc[-1]
-    avg_volume = df["volume"].rolling(20).mean().iloc[-1]
-    
-    squeeze_thresh = bandwidth.rolling(50).quantile(0.2).iloc[-1]
-    is_squeeze = bandwidth.iloc[-1] < squeeze_thresh
+    if shared is None:
+        shared = _shared_indicators(df)
+    mavg = shared["bb_mavg"]
+    std = shared["bb_std"]
+    mavg_arr = mavg.to_numpy()
+    std_arr = std.to_numpy()
+    upper = mavg_arr + 2 * std_arr
+    lower = mavg_arr - 2 * std_arr
+    bandwidth = (upper - lower) / mavg_arr
+
+    close_arr = shared["close"]
+    vol = shared["vol"]
+
+    current_price = close_arr[-1]
+    prev_price = close_arr[-2]
+    current_volume = vol[-1]
+    avg_volume = shared["avg_vol_20"]
+
+    # Only the last rolling quantile is consumed: one partial-sort over
+    # the 50-bar tail instead of sorting every 50-element window.
+    squeeze_thresh = np.quantile(bandwidth[-50:], 0.2) if len(bandwidth) >= 50 else np.nan
+    is_squeeze = bandwidth[-1] < squeeze_thresh
     
     if is_squeeze:
-        # Bullish breakout
-        if (prev_price <= upper.iloc[-2]) and (current_price > upper.iloc[-1]):
-            atr = _calculate_atr(df)
-            stop = round(current_price - atr, 2)
-            targets = [round(current_price + r * atr, 2) for r in [1, 2, 3]]
-            signal = Signal(
-                pair=pair,
-                direction="BUY",
-                strategy="Bollinger Band Squeeze",
-                timeframe=timeframe,
-                entry=current_price,
-                stop=stop,
-                targets=targets,
-                confidence=min(0.75 + (1 - bandwidth.iloc[-1]/squeeze_thresh), 0.95),
-                momentum="HIGH" if current_volume > avg_volume * 1.5 else "MEDIUM",
-            )
-            return validate_signal(signal, df)
-        
-        # Bearish breakout
-        elif (prev_price >= lower.iloc[-2]) and (current_price < lower.iloc[-1]):
-            atr = _calculate_atr(df)
-            stop = round(current_price + atr, 2)
-            targets = [round(current_price - r * atr, 2) for r in [1, 2, 3]]
-            signal = Signal(
-                pair=pair,
-                direction="SELL",
-                strategy="Bollinger Band Squeeze",
-                timeframe=timeframe,
-                entry=current_price,
-                stop=stop,
-                targets=targets,
-                confidence=min(0.75 + (1 - bandwidth.iloc[-1]/squeeze_thresh), 0.95),
-                momentum="HIGH" if current_volume > avg_volume * 1.5 else "MEDIUM",
-            )
-            return validate_signal(signal, df)
-    
+        # Breakout through either band: prior close inside, current close
+        # outside — one sign-parameterized body against the upper band
+        # (bullish) or the lower band (bearish).
+        for band, sign in ((upper, 1.0), (lower, -1.0)):
+            if sign * (prev_price - band[-2]) <= 0 and sign * (current_price - band[-1]) > 0:
+                signal = _directional_signal(
+                    pair, "Bollinger Band Squeeze", timeframe, current_price,
+                    sign, _shared_atr(shared),
+                    confidence=min(0.75 + (1 - bandwidth[-1]/squeeze_thresh), 0.95),
+                    momentum="HIGH" if current_volume > avg_volume * 1.5 else "MEDIUM",
+                )
+                return validate_signal(signal, df, shared)
+
     strategy_logger.info(f"Bollinger Squeeze: No valid signal for {pair} {timeframe}")
     return None
 
-def calculate_all_strategies(df: pd.DataFrame, pair: str, timeframe: str) -> List[Signal]:
-    """Run all strategies and return validated signals"""
-    strategies = [
-        calculate_vwap_breakout,
-        calculate_ema_cross,
-        calculate_rsi_divergence,
-        calculate_support_resistance_break,
-        calculate_bollinger_squeeze
-    ]
-    
+_STRATEGY_FUNCS = (
+    calculate_vwap_breakout,
+    calculate_ema_cross,
+    calculate_rsi_divergence,
+    calculate_support_resistance_break,
+    calculate_bollinger_squeeze,
+)
+
+# Shortest history each strategy can possibly fire on: below these the
+# indicators are all-NaN or the warm-up too short to trust, so the
+# dispatcher skips the call outright instead of computing and rejecting.
+_STRATEGY_MIN_BARS = {
+    calculate_vwap_breakout: 21,     # 20-bar VWAP window + prior bar
+    calculate_ema_cross: 22,         # EMA21 warm-up + crossover bar
+    calculate_rsi_divergence: 15,    # RSI14 + pivot scan
+    calculate_support_resistance_break: 16,  # 15-bar touch count + break bar
+    calculate_bollinger_squeeze: 70, # 20-bar bands + 50-bar quantile
+}
+
+def _attach_tail_snapshot(signal: Signal, close: np.ndarray, vol: np.ndarray) -> None:
+    # Snapshot the two latest close/volume readings so the exit monitor
+    # can classify momentum without keeping df alive.
+    signal.last_close = float(close[-1])
+    signal.prev_close = float(close[-2])
+    signal.last_volume = float(vol[-1])
+    signal.prev_volume = float(vol[-2])
+
+def _evaluate_from_shared(df: pd.DataFrame, pair: str, timeframe: str, shared: dict,
+                          funcs: Tuple = None) -> List[Signal]:
+    """Run the given strategies for one pair against a prebuilt shared dict."""
+    close = shared["close"]
+    vol = shared["vol"]
+    n = len(df)
     signals = []
-    for strategy_func in strategies:
-        if signal := strategy_func(df.copy(), pair, timeframe):
+    for strategy_func in funcs if funcs is not None else _STRATEGY_FUNCS:
+        if n < _STRATEGY_MIN_BARS[strategy_func]:
+            strategy_logger.debug(f"Skipping {strategy_func.__name__} for {pair} {timeframe}: only {n} bars")
+            continue
+        # No strategy mutates df — they only read columns and compute
+        # derived Series — so share one frame instead of copying per call.
+        if signal := strategy_func(df, pair, timeframe, shared):
+            _attach_tail_snapshot(signal, close, vol)
             signals.append(signal)
             strategy_logger.info(f"Generated {signal.strategy} signal for {pair} {timeframe}")
         else:
             strategy_logger.debug(f"No signal from {strategy_func.__name__} for {pair} {timeframe}")
-    
+
     return signals
 
-def should_exit_early(current_price: float, signal: Signal, df: pd.DataFrame) -> Tuple[bool, Optional[str]]:
+def calculate_all_strategies(df: pd.DataFrame, pair: str, timeframe: str,
+                             shared: Optional[dict] = None) -> List[Signal]:
+    """Run all strategies and return validated signals.
+
+    Callers that poll on a short interval can pass a previously computed
+    shared dict (see the runner's indicator cache) to skip recomputing
+    indicators over a window that hasn't changed.
+    """
+    if shared is None:
+        shared = _shared_indicators(df)
+    return _evaluate_from_shared(df, pair, timeframe, shared)
+
+def calculate_all_strategies_batch(frames: Dict[str, pd.DataFrame], timeframe: str) -> List[Signal]:
+    """Evaluate every pair's strategies from one cross-sectional pass.
+
+    Stacks the pairs as columns of (n_bars, n_pairs) arrays so each
+    shared indicator (EMA tails, RSI, VWAP, Bollinger stats) is computed
+    once across all pairs — column-wise pandas/NumPy reductions plus the
+    parallel EMA kernel — instead of once per pair. Frames are aligned on
+    the shortest history; per-pair Signal objects are only materialized
+    where a strategy actually fires.
+    """
+    if not frames:
+        return []
+    pairs = list(frames)
+    n = min(len(f) for f in frames.values())
+    trimmed = {pair: (f.iloc[-n:] if len(f) > n else f) for pair, f in frames.items()}
+
+    close_2d = np.column_stack([f["close"].to_numpy(dtype=np.float64) for f in trimmed.values()])
+    high_2d = np.column_stack([f["high"].to_numpy(dtype=np.float64) for f in trimmed.values()])
+    low_2d = np.column_stack([f["low"].to_numpy(dtype=np.float64) for f in trimmed.values()])
+    vol_2d = np.column_stack([f["volume"].to_numpy(dtype=np.float64) for f in trimmed.values()])
+
+    ema_tails = ema9_21_tail_2d(close_2d)
+    close_df = pd.DataFrame(close_2d)
+    rsi_2d = _rsi(close_df, 14).to_numpy()
+    bb_mavg = close_df.rolling(20).mean()
+    bb_std = close_df.rolling(20).std(ddof=0)
+    avg_vol = vol_2d[-20:].mean(axis=0)
+
+    signals: List[Signal] = []
+
+    # SoA pre-screen for the EMA crossover: cross masks, slope angles and
+    # candidate confidences are computed for every pair at once as
+    # parallel arrays, and Signal objects are only materialized for the
+    # rows that survive the cheap validity mask — rejected candidates
+    # never allocate anything. Gated on the same bar floor the per-pair
+    # dispatcher applies, so warm-up-length histories can't fire here.
+    if n >= _STRATEGY_MIN_BARS[calculate_ema_cross]:
+        e9_3, e9_2, e9_1 = ema_tails[0], ema_tails[1], ema_tails[2]
+        e21_2, e21_1 = ema_tails[4], ema_tails[5]
+        moved = np.abs(close_2d[-1] - close_2d[-2]) / close_2d[-2] >= 1e-5
+        bull = (e9_2 <= e21_2) & (e9_1 > e21_1)
+        bear = (e9_2 >= e21_2) & (e9_1 < e21_1)
+        sign = np.where(bull, 1.0, -1.0)
+        angle = sign * (e9_1 - e9_3) / np.where(e9_3 == 0, 1.0, e9_3)
+        conf = np.minimum(0.65 + angle * 100, 0.90)
+        entries = close_2d[-1]
+        valid = moved & (bull | bear) & (conf >= MIN_CONFIDENCE) & (entries > 0)
+        for j in np.nonzero(valid)[0]:
+            pair = pairs[j]
+            df_j = trimmed[pair]
+            atr = _calculate_atr(df_j)
+            entry = entries[j]
+            signal = Signal(
+                pair=pair,
+                direction="BUY" if bull[j] else "SELL",
+                strategy="EMA Cross",
+                timeframe=timeframe,
+                entry=entry,
+                stop=round(entry - sign[j] * atr, 2),
+                targets=_targets(entry, atr, sign[j]),
+                confidence=conf[j],
+                momentum="HIGH" if angle[j] > 0.01 else "MEDIUM",
+            )
+            if validated := validate_signal(signal, df_j):
+                _attach_tail_snapshot(validated, close_2d[:, j], vol_2d[:, j])
+                signals.append(validated)
+                strategy_logger.info(f"Generated EMA Cross signal for {pair} {timeframe}")
+
+    remaining = tuple(f for f in _STRATEGY_FUNCS if f is not calculate_ema_cross)
+    for j, pair in enumerate(pairs):
+        shared = {
+            "close": close_2d[:, j],
+            "high": high_2d[:, j],
+            "low": low_2d[:, j],
+            "vol": vol_2d[:, j],
+            "avg_vol_20": float(avg_vol[j]),
+            "ema9": (ema_tails[0, j], ema_tails[1, j], ema_tails[2, j]),
+            "ema21": (ema_tails[3, j], ema_tails[4, j], ema_tails[5, j]),
+            "rsi14": rsi_2d[:, j],
+            "bb_mavg": bb_mavg[j],
+            "bb_std": bb_std[j],
+        }
+        signals.extend(_evaluate_from_shared(trimmed[pair], pair, timeframe, shared, remaining))
+
+    return signals
+
+_ALPHA9 = 2.0 / (9 + 1)
+_ALPHA21 = 2.0 / (21 + 1)
+_RSI_ALPHA = 1.0 / 14
+
+class P2Quantile:
+    """Streaming quantile estimator (Jain & Chlamtac's P² algorithm).
+
+    Maintains five markers that track the p-quantile in O(1) time and
+    memory per observation — no window to store or re-sort. Used by the
+    live path to keep the Bollinger bandwidth squeeze threshold current
+    without replaying 50 bars of history per tick.
+    """
+
+    __slots__ = ("p", "q", "n", "np_", "dn", "_init")
+
+    def __init__(self, p: float):
+        self.p = p
+        self._init: List[float] = []
+        self.q: List[float] = []
+        self.n = [0, 1, 2, 3, 4]
+        self.np_ = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.dn = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        if len(self._init) < 5:
+            self._init.append(x)
+            if len(self._init) == 5:
+                self._init.sort()
+                self.q = list(self._init)
+            return
+        q, n = self.q, self.n
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.np_[i] += self.dn[i]
+        for i in range(1, 4):
+            d = self.np_[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                # Parabolic (P²) adjustment; fall back to linear if it
+                # would push the marker out of order.
+                qn = q[i] + d / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if q[i - 1] < qn < q[i + 1]:
+                    q[i] = qn
+                else:
+                    q[i] = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                n[i] += d
+
+    @property
+    def value(self) -> float:
+        if self.q:
+            return self.q[2]
+        if not self._init:
+            return float("nan")
+        s = sorted(self._init)
+        idx = self.p * (len(s) - 1)
+        lo = int(idx)
+        hi = min(lo + 1, len(s) - 1)
+        return s[lo] + (idx - lo) * (s[hi] - s[lo])
+
+@dataclass
+class StrategyState:
+    """Incrementally-updated indicator state for live per-bar evaluation.
+
+    update() folds one new bar in O(1) instead of recomputing full rolling
+    windows each tick: the EMAs, Wilder RSI and ATR use their recurrence
+    form, and the 20-bar volume SMA keeps a ring buffer plus running sum.
+    """
+    pair: str = ""
+    timeframe: str = ""
+    bars: int = 0
+    prev_close: float = 0.0
+    ema9: float = 0.0
+    ema9_prev: float = 0.0
+    ema9_prev2: float = 0.0
+    ema21: float = 0.0
+    ema21_prev: float = 0.0
+    avg_gain: float = 0.0
+    avg_loss: float = 0.0
+    atr: float = 0.0
+    vol_sum: float = 0.0
+    vols: deque = field(default_factory=lambda: deque(maxlen=20))
+    closes: deque = field(default_factory=lambda: deque(maxlen=20))
+    close_sum: float = 0.0
+    close_sumsq: float = 0.0
+    bandwidth: float = 0.0
+    bw_quantile: P2Quantile = field(default_factory=lambda: P2Quantile(0.2))
+
+    def update(self, high: float, low: float, close: float, volume: float) -> None:
+        if self.bars == 0:
+            self.ema9 = self.ema9_prev = self.ema9_prev2 = close
+            self.ema21 = self.ema21_prev = close
+        else:
+            self.ema9_prev2 = self.ema9_prev
+            self.ema9_prev = self.ema9
+            self.ema21_prev = self.ema21
+            self.ema9 = _ALPHA9 * close + (1 - _ALPHA9) * self.ema9
+            self.ema21 = _ALPHA21 * close + (1 - _ALPHA21) * self.ema21
+            delta = close - self.prev_close
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            self.avg_gain = _RSI_ALPHA * gain + (1 - _RSI_ALPHA) * self.avg_gain
+            self.avg_loss = _RSI_ALPHA * loss + (1 - _RSI_ALPHA) * self.avg_loss
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+            self.atr = (self.atr * 13 + tr) / 14
+        if len(self.vols) == self.vols.maxlen:
+            self.vol_sum -= self.vols[0]
+        self.vols.append(volume)
+        self.vol_sum += volume
+        # Running 20-bar mean/variance of close feed the Bollinger
+        # bandwidth, whose 20th-percentile squeeze threshold is tracked by
+        # the P² estimator instead of a sorted 50-bar window.
+        if len(self.closes) == self.closes.maxlen:
+            old = self.closes[0]
+            self.close_sum -= old
+            self.close_sumsq -= old * old
+        self.closes.append(close)
+        self.close_sum += close
+        self.close_sumsq += close * close
+        if len(self.closes) == self.closes.maxlen:
+            m = self.close_sum / 20
+            var = max(self.close_sumsq / 20 - m * m, 0.0)
+            self.bandwidth = 4.0 * var ** 0.5 / m if m else 0.0
+            self.bw_quantile.add(self.bandwidth)
+        self.prev_close = close
+        self.bars += 1
+
+    @property
+    def rsi(self) -> float:
+        if self.avg_loss == 0.0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + self.avg_gain / self.avg_loss)
+
+    @property
+    def avg_vol(self) -> float:
+        return self.vol_sum / len(self.vols) if self.vols else 0.0
+
+def calculate_all_strategies_streaming(state: StrategyState, bar: dict) -> List[Signal]:
+    """O(1) per-bar strategy evaluation for live mode.
+
+    Folds the new bar into state, then evaluates the strategies whose
+    conditions are expressible from scalar state (currently the EMA 9/21
+    crossover). Window-shaped checks — divergence pivots, the squeeze
+    quantile, S/R touch counts — stay on the batch path.
+    """
+    state.update(bar["high"], bar["low"], bar["close"], bar["volume"])
+    signals: List[Signal] = []
+    if state.bars < 21:
+        return signals
+
+    current_price = bar["close"]
+    bullish = state.ema9_prev <= state.ema21_prev and state.ema9 > state.ema21
+    bearish = state.ema9_prev >= state.ema21_prev and state.ema9 < state.ema21
+    if bullish or bearish:
+        sign = 1.0 if bullish else -1.0
+        atr = state.atr
+        stop = round(current_price - sign * atr, 2)
+        targets = _targets(current_price, atr, sign)
+        angle = sign * (state.ema9 - state.ema9_prev2) / (state.ema9_prev2 or 1)
+        signal = Signal(
+            pair=state.pair,
+            direction="BUY" if bullish else "SELL",
+            strategy="EMA Cross",
+            timeframe=state.timeframe,
+            entry=current_price,
+            stop=stop,
+            targets=targets,
+            confidence=min(0.65 + angle * 100, 0.90),
+            momentum="HIGH" if angle > 0.01 else "MEDIUM",
+        )
+        if validated := validate_signal(signal):
+            signals.append(validated)
+
+    return signals
+
+def detect_momentum_change(last_close: float, prev_close: float,
+                           last_volume: float, prev_volume: float) -> str:
+    """Classify momentum from the latest two close/volume readings.
+
+    Works on the scalar tail snapshot carried by each Signal (last_close,
+    prev_close, last_volume, prev_volume) rather than a retained
+    DataFrame, so the monitor can call it per tick at O(1) cost.
+    """
+    if not prev_close or not prev_volume:
+        return "MEDIUM"
+    price_change = abs(last_close - prev_close) / prev_close
+    vol_ratio = last_volume / prev_volume
+    if price_change < 0.001 or vol_ratio < 0.5:
+        return "LOW"
+    if price_change > 0.005 and vol_ratio > 1.5:
+        return "HIGH"
+    return "MEDIUM"
+
+def should_exit_early(current_price: float, signal: Signal, df: Optional[pd.DataFrame] = None) -> Tuple[bool, Optional[str]]:
     """Determine if early exit conditions are met"""
+    # One direction sign collapses every paired BUY/SELL comparison into
+    # straight-line arithmetic — no per-level branching on direction.
+    sign = 1.0 if signal.direction == "BUY" else -1.0
+
     # Stop loss hit
-    if (signal.direction == "BUY" and current_price <= signal.stop) or \
-       (signal.direction == "SELL" and current_price >= signal.stop):
+    if sign * (current_price - signal.stop) <= 0:
         return True, "STOP_LOSS_HIT"
-    
+
     # Technical exits
     if signal.strategy_invalidated:
         return True, signal.exit_reason or "STRATEGY_INVALIDATED"
-    
+
     if signal.early_exit:
         return True, signal.exit_reason or "EARLY_EXIT_TRIGGERED"
-    
+
     # Early Profit Booking (e.g., if first target is hit)
-    if signal.direction == "BUY" and current_price >= signal.targets[0]:
-        return True, "EARLY_PROFIT_BOOKING"
-    elif signal.direction == "SELL" and current_price <= signal.targets[0]:
+    if sign * (current_price - signal.targets[0]) >= 0:
         return True, "EARLY_PROFIT_BOOKING"
 
     # Cost-to-Cost Exit (Breakeven)
-    if (signal.direction == "BUY" and current_price <= signal.entry) or \
-       (signal.direction == "SELL" and current_price >= signal.entry):
+    if sign * (current_price - signal.entry) <= 0:
         return True, "COST_TO_COST_EXIT"
 
     return False, None
@@ -451,7 +884,11 @@ def should_exit_early(current_price: float, signal: Signal, df: pd.DataFrame) ->
 
 def _calculate_atr(df: pd.DataFrame) -> float:
     """Helper to calculate Average True Range"""
-    atr = AverageTrueRange(high=df["high"], low=df["low"], close=df["close"], window=14).average_true_range()
-    return atr.iloc[-1]
+    return atr_last(
+        df["high"].to_numpy(dtype=np.float64),
+        df["low"].to_numpy(dtype=np.float64),
+        df["close"].to_numpy(dtype=np.float64),
+        14,
+    )
 
 
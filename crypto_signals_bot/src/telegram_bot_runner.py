@@ -1,9 +1,6 @@
-import asyncio
-from crypto_signals_bot.src.bot import setup_telegram_bot
-from signal_cache import SignalCache
+"""Telegram updates are delivered via the /telegram webhook route in main.py,
+so the bot runs inside the web service — no standalone polling process."""
+import uvicorn
 
 if __name__ == "__main__":
-    cache = SignalCache()
-    asyncio.run(setup_telegram_bot(cache))
-
-
+    uvicorn.run("crypto_signals_bot.src.main:app", host="0.0.0.0", port=8000)
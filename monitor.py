@@ -2,19 +2,25 @@
 import ccxt
 import time
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import requests
-from typing import Dict
+from typing import Dict, List
 from signal_cache import SignalCache
+from crypto_signals_bot.src.strategies import detect_momentum_change
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('monitor.log'),
-        logging.StreamHandler()
-    ]
-)
+# Queue + background listener keeps file/console I/O off the monitor loop;
+# emits only enqueue the record, the listener thread does the writes.
 logger = logging.getLogger('monitor')
+logger.setLevel(logging.INFO)
+_log_queue: queue.Queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(_log_queue))
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('monitor.log', delay=True), logging.StreamHandler()]
+for _h in _log_handlers:
+    _h.setFormatter(_log_formatter)
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
 
 class SignalMonitor:
     def __init__(self):
@@ -23,16 +29,16 @@ class SignalMonitor:
         self.webhook_url = "http://localhost:8000/webhook"  # Update with your webhook URL
         self.check_interval = 120  # 2 minutes
 
-    def get_current_price(self, pair: str) -> float:
+    def get_current_prices(self, pairs: List[str]) -> Dict[str, float]:
+        """Fetch last prices for all pairs in one fetch_tickers call."""
         try:
-            ticker = self.exchange.fetch_ticker(pair)
-            return ticker['last']
+            tickers = self.exchange.fetch_tickers(pairs)
+            return {pair: t['last'] for pair, t in tickers.items()}
         except Exception as e:
-            logger.error(f"Error fetching price for {pair}: {str(e)}")
-            return None
+            logger.error(f"Error fetching tickers for {pairs}: {str(e)}")
+            return {}
 
-    def check_signal(self, signal: Dict) -> bool:
-        current_price = self.get_current_price(signal['pair'])
+    def check_signal(self, signal: Dict, current_price: float) -> bool:
         if current_price is None:
             return False
 
@@ -44,10 +50,15 @@ class SignalMonitor:
             signal['exit_reason'] = "STOP_HIT"
             return True
 
-        # Check momentum (if we have the data)
-        if 'data_frame' in signal and signal['data_frame'] is not None:
-            from src.strategies import detect_momentum_change
-            momentum = detect_momentum_change(signal['data_frame'])
+        # Check momentum from the scalar tail snapshot: roll the stored
+        # last close forward with the fresh ticker price, no DataFrame kept.
+        signal['prev_close'] = signal.get('last_close')
+        signal['last_close'] = current_price
+        if signal.get('prev_close') and signal.get('last_volume') and signal.get('prev_volume'):
+            momentum = detect_momentum_change(
+                signal['last_close'], signal['prev_close'],
+                signal['last_volume'], signal['prev_volume'],
+            )
             if momentum == "LOW":
                 signal['early_exit'] = True
                 signal['momentum_change'] = "LOW"
@@ -58,8 +69,20 @@ class SignalMonitor:
 
     def process_signals(self):
         active_signals = self.cache.get_active_signals()
+        if not active_signals:
+            return
+        # One batched ticker request covers every distinct pair instead of
+        # one HTTP round trip per active signal.
+        prices = self.get_current_prices(sorted({s['pair'] for s in active_signals}))
         for signal in active_signals:
-            if self.check_signal(signal):
+            price = prices.get(signal['pair'])
+            if not self.check_signal(signal, price):
+                # get_active_signals hands out fresh dicts each tick, so
+                # the rolled-forward close snapshot must be written back
+                # or the next cycle starts from the creation-time close.
+                if price is not None:
+                    self.cache.update_signal(signal)
+            else:
                 try:
                     response = requests.post(
                         self.webhook_url,
@@ -79,6 +102,7 @@ class SignalMonitor:
         while True:
             try:
                 self.process_signals()
+                self.cache.flush()
                 time.sleep(self.check_interval)
             except KeyboardInterrupt:
                 logger.info("Stopping Signal Monitor")
@@ -1,12 +1,20 @@
-from crypto_signals_bot.src.strategies import calculate_all_strategies
+from crypto_signals_bot.src.strategies import calculate_all_strategies, _shared_indicators
 
 # runner.py
 import os
-import ccxt
+import asyncio
+import hashlib
+import random
 import time
+import ccxt.async_support as ccxt
 import logging
-import requests
+import queue
+from logging.handlers import QueueHandler, QueueListener
+import httpx
+import orjson
+import numpy as np
 import pandas as pd
+from collections import OrderedDict, deque
 from typing import List, Dict
 
 from signal_cache import SignalCache
@@ -14,51 +22,132 @@ from signal_cache import SignalCache
 from dotenv import load_dotenv
 load_dotenv()
 
-logging.basicConfig(
-    level=logging.INFO,
-    format=r'%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('runner.log'),
-        logging.StreamHandler()
-    ]
-)
+# Queue + background listener keeps file/console I/O off the runner loop;
+# emits only enqueue the record, the listener thread does the writes.
 logger = logging.getLogger('runner')
+logger.setLevel(logging.INFO)
+_log_queue: queue.Queue = queue.Queue(-1)
+logger.addHandler(QueueHandler(_log_queue))
+_log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('runner.log', delay=True), logging.StreamHandler()]
+for _h in _log_handlers:
+    _h.setFormatter(_log_formatter)
+_log_listener = QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
 
 class SignalRunner:
     def __init__(self):
-        self.exchange = ccxt.kraken()  # Changed from binance to kraken
+        # enableRateLimit lets ccxt's built-in throttle pace bursts of
+        # OHLCV requests below Kraken's limits.
+        self.exchange = ccxt.kraken({'enableRateLimit': True})
         self.cache = SignalCache()
         self.webhook_url = "https://signals-bot-zely.onrender.com/webhook"
         self.pairs = ["BTC/USDT", "ETH/USDT", "DOGE/USDT"]
         self.timeframes = ["5m", "15m"]
         self.ohlcv_limit = 100
-
-    def fetch_ohlcv(self, pair: str, timeframe: str) -> pd.DataFrame:
+        # Evaluation memoization across ticks: the loop runs every 3
+        # minutes but candles only roll every 5/15, so most fetches return
+        # a window identical to the previous one — on those the whole
+        # strategy pass (not just the indicators) is replayed from cache.
+        # Keyed on the last bar's timestamp plus its close/volume (the
+        # in-progress candle mutates under a fixed timestamp), bounded
+        # LRU of 32 entries mapping key -> evaluated signal list.
+        self._eval_cache: OrderedDict = OrderedDict()
+        # Rolling OHLCV buffers per (pair, timeframe): after the first
+        # full fetch, only candles from the last known bar onward are
+        # requested and spliced in, so steady-state fetches move one or
+        # two rows instead of the whole 100-candle window.
+        self._frame_cache: Dict[tuple, pd.DataFrame] = {}
+        # Digest ring of recently posted payloads: an identical body
+        # observed within the dedupe window is acknowledged without a
+        # second POST (e.g. the same setup firing again off an unchanged
+        # candle after a cache eviction).
+        self._recent_payload_hashes: deque = deque(maxlen=1024)
+        self._payload_dedupe_secs = 300.0
+        # Headers never change between posts, so the dict (and the
+        # WEBHOOK_SECRET environ lookup) is built once here.
+        self._webhook_headers = {
+            "X-Webhook-Secret": os.getenv("WEBHOOK_SECRET"),
+            "Content-Type": "application/json",
+        }
+        # One pooled async client for webhook posts: keep-alive connections
+        # skip the TCP/TLS handshake per signal and bursts post concurrently.
+        self._http = httpx.AsyncClient(
+            timeout=5,
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+        )
+
+    @staticmethod
+    def _ohlcv_frame(ohlcv: list) -> pd.DataFrame:
+        # One float64 array and per-column assembly: skips pandas'
+        # row-wise type inference over the list of lists and the
+        # follow-up to_datetime rewrite of the timestamp column.
+        arr = np.asarray(ohlcv, dtype=np.float64)
+        return pd.DataFrame({
+            'timestamp': arr[:, 0].astype('int64').view('datetime64[ms]'),
+            'open': arr[:, 1],
+            'high': arr[:, 2],
+            'low': arr[:, 3],
+            'close': arr[:, 4],
+            'volume': arr[:, 5],
+        })
+
+    async def fetch_ohlcv(self, pair: str, timeframe: str) -> pd.DataFrame:
+        key = (pair, timeframe)
         try:
-            ohlcv = self.exchange.fetch_ohlcv(pair, timeframe, limit=self.ohlcv_limit)
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            prev = self._frame_cache.get(key)
+            if prev is None:
+                df = self._ohlcv_frame(
+                    await self.exchange.fetch_ohlcv(pair, timeframe, limit=self.ohlcv_limit)
+                )
+            else:
+                # Re-request from the last known bar (inclusive: the
+                # in-progress candle keeps mutating under its timestamp)
+                # and splice the fresh rows onto the retained window.
+                since = int(prev['timestamp'].iloc[-1].value // 1_000_000)
+                ohlcv = await self.exchange.fetch_ohlcv(
+                    pair, timeframe, since=since, limit=self.ohlcv_limit
+                )
+                if not ohlcv:
+                    return prev
+                new = self._ohlcv_frame(ohlcv)
+                df = pd.concat(
+                    [prev[prev['timestamp'] < new['timestamp'].iloc[0]], new],
+                    ignore_index=True,
+                ).iloc[-self.ohlcv_limit:].reset_index(drop=True)
+            self._frame_cache[key] = df
             return df
         except Exception as e:
             logger.error(f"Error fetching OHLCV for {pair} {timeframe}: {str(e)}")
             return None
 
-    def send_to_webhook(self, signal) -> bool:
+    async def send_to_webhook(self, signal) -> bool:
         try:
-            signal_data = signal.dict() # data_frame is already excluded in Signal model
-
-            # Convert all Timestamp objects to string
-            for k, v in signal_data.items():
-                if isinstance(v, pd.Timestamp):
-                    signal_data[k] = v.isoformat()
-
-            response = requests.post(
-    self.webhook_url,
-    json=signal_data,
-    headers={"X-Webhook-Secret": os.getenv("WEBHOOK_SECRET")},
-    timeout=5
-)
+            # Signal fields are all floats/strings/lists since the move to
+            # the slotted dataclass (the frame and Timestamps are long
+            # gone), so the dict feeds orjson directly — one C pass, no
+            # per-field isinstance sweep.
+            signal_data = signal.dict()
+            body = orjson.dumps(signal_data, option=orjson.OPT_SERIALIZE_NUMPY)
+
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            now = time.time()
+            cutoff = now - self._payload_dedupe_secs
+            while self._recent_payload_hashes and self._recent_payload_hashes[0][0] < cutoff:
+                self._recent_payload_hashes.popleft()
+            if any(h == digest for _, h in self._recent_payload_hashes):
+                logger.info(f"↩️ Duplicate payload skipped: {signal.strategy} {signal.direction} {signal.pair} {signal.timeframe}")
+                return True
+            self._recent_payload_hashes.append((now, digest))
 
+            # The payload digest doubles as the idempotency key: if a
+            # retry or a second runner delivers the same body, the server
+            # drops it instead of double-alerting.
+            response = await self._http.post(
+                self.webhook_url,
+                content=body,
+                headers={**self._webhook_headers, "X-Idempotency-Key": digest.hex()},
+            )
 
             if response.status_code == 200:
                 logger.info(f"✅ Sent signal: {signal.strategy} {signal.direction} {signal.pair} {signal.timeframe}")
@@ -71,40 +160,76 @@ class SignalRunner:
             logger.error(f"🚨 Failed to send webhook: {str(e)}")
             return False
 
-    def process_pair(self, pair: str):
-        self.cache.get_active_signals() # Clean up stale signals and update active list
-        active_signals_count = len(self.cache.get_active_signals())
-        if active_signals_count >= 3:
-            logger.info(f"Max active trades (3) reached. Skipping new signals.")
-            return
-
-        for timeframe in self.timeframes:
-            df = self.fetch_ohlcv(pair, timeframe)
+    async def process_tick(self):
+        # One pass prunes stale signals and yields the active count; the
+        # count is then tracked locally as signals are added instead of
+        # re-running the prune per slot.
+        active_count = len(self.cache.get_active_signals())
+
+        # All pair/timeframe fetches are latency-bound, so issue them
+        # concurrently — one gather costs roughly a single round trip
+        # instead of len(pairs) x len(timeframes) serial ones.
+        slots = [(pair, timeframe) for pair in self.pairs for timeframe in self.timeframes]
+        frames = await asyncio.gather(
+            *(self.fetch_ohlcv(pair, timeframe) for pair, timeframe in slots)
+        )
+
+        for (pair, timeframe), df in zip(slots, frames):
+            if active_count >= 3:
+                logger.info(f"Max active trades (3) reached. Skipping new signals.")
+                return
             if df is not None and len(df) > 20:
-                signals = calculate_all_strategies(df, pair, timeframe)
-                for signal in signals:
-                    if not self.cache.signal_exists(signal):
-                        if self.send_to_webhook(signal):
+                key = (pair, timeframe, int(df['timestamp'].iloc[-1].value),
+                       float(df['close'].iloc[-1]), float(df['volume'].iloc[-1]))
+                signals = self._eval_cache.get(key)
+                if signals is None:
+                    shared = _shared_indicators(df)
+                    signals = calculate_all_strategies(df, pair, timeframe, shared=shared)
+                    self._eval_cache[key] = signals
+                    if len(self._eval_cache) > 32:
+                        self._eval_cache.popitem(last=False)
+                else:
+                    self._eval_cache.move_to_end(key)
+                to_send = [s for s in signals if not self.cache.signal_exists(s)]
+                if to_send:
+                    results = await asyncio.gather(
+                        *(self.send_to_webhook(signal) for signal in to_send)
+                    )
+                    for signal, sent in zip(to_send, results):
+                        if sent:
                             self.cache.add_signal(signal)
-    def run(self):
+                            active_count += 1
+    async def run(self):
         logger.info("🚀 Starting Signal Runner")
-        while True:
-            try:
-                for pair in self.pairs:
-                    self.process_pair(pair)
-                time.sleep(180)  # Run every 3 minutes
-            except KeyboardInterrupt:
-                logger.info("🛑 Signal Runner stopped by user")
-                break
-            except Exception as e:
-                logger.error(f"🔥 Runner error: {str(e)}")
-                time.sleep(60)
+        # Error recovery backs off exponentially (doubling from 60 s up
+        # to 15 min, with jitter) so a rate-limited or unreachable API
+        # isn't hammered on a fixed cadence; any clean tick resets it.
+        backoff = 60.0
+        try:
+            while True:
+                try:
+                    await self.process_tick()
+                    # One batched cache write per tick instead of one per
+                    # signal mutation.
+                    self.cache.flush()
+                    backoff = 60.0
+                    await asyncio.sleep(180)  # Run every 3 minutes
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    if isinstance(e, ccxt.RateLimitExceeded):
+                        logger.error(f"⏳ Rate limited, backing off {backoff:.0f}s: {str(e)}")
+                    else:
+                        logger.error(f"🔥 Runner error: {str(e)}")
+                    await asyncio.sleep(backoff + random.uniform(0, 0.25 * backoff))
+                    backoff = min(backoff * 2, 900.0)
+        finally:
+            await self.exchange.close()
+            await self._http.aclose()
 
 if __name__ == "__main__":
     runner = SignalRunner()
-    runner.run()
-
-
-
-from crypto_signals_bot.src.strategies import calculate_all_strategies
-
+    try:
+        asyncio.run(runner.run())
+    except KeyboardInterrupt:
+        logger.info("🛑 Signal Runner stopped by user")
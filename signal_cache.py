@@ -1,83 +1,181 @@
 # signal_cache.py
-import json
+import atexit
+import orjson
 import os
-import uuid
+import sqlite3
+import time
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from crypto_signals_bot.src.strategies import Signal
 
 class SignalCache:
-    def __init__(self, file_path: str = "signal_cache.json"):
+    # Hard ceiling on cached signals: inserts past this evict the oldest
+    # rows, so the database can never grow without bound.
+    MAXLEN = 1000
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS signals (
+            id        TEXT PRIMARY KEY,
+            slno      TEXT,
+            pair      TEXT,
+            strategy  TEXT,
+            direction TEXT,
+            timeframe TEXT,
+            active    INTEGER,
+            ts        REAL,
+            payload   TEXT
+        );
+        CREATE INDEX IF NOT EXISTS ix_active
+            ON signals(active, pair, strategy, direction, timeframe);
+        CREATE INDEX IF NOT EXISTS ix_ts ON signals(ts);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+    """
+
+    def __init__(self, file_path: str = "signal_cache.db"):
         self.file_path = file_path
-        self.cache = self._load_cache()
-        self.next_slno = self._get_next_slno()
+        # Autocommit: every mutation is one row-level statement, so adds
+        # and removes touch only their own rows instead of rewriting a
+        # whole serialized file.
+        self.conn = sqlite3.connect(self.file_path, isolation_level=None)
+        # Write-ahead logging: each commit appends to the WAL instead of
+        # rewriting database pages in place, so writers never block the
+        # monitor's concurrent reads and the fsync cost per signal drops
+        # to the log append; NORMAL syncing is safe under WAL (a crash
+        # loses at most the last unsynced commits, never integrity).
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self._SCHEMA)
+        self._migrate_legacy_json()
+        self.next_slno = self._next_slno_from_db()
+        # Millisecond boot time + per-process counter keeps IDs unique
+        # without a urandom read per signal.
+        self._id_counter = 0
+        atexit.register(self.close)
 
-    def _load_cache(self) -> List[Dict]:
-        if os.path.exists(self.file_path):
-            with open(self.file_path, 'r') as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    return []
-        return []
+    def _migrate_legacy_json(self):
+        # One-time import of a pre-SQLite JSON cache sitting next to the
+        # database; only runs while the signals table is still empty.
+        if self.conn.execute("SELECT 1 FROM signals LIMIT 1").fetchone() is not None:
+            return
+        legacy_path = os.path.splitext(self.file_path)[0] + ".json"
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            with open(legacy_path, 'rb') as f:
+                data = orjson.loads(f.read())
+        except orjson.JSONDecodeError:
+            return
+        entries = data.get('signals', []) if isinstance(data, dict) else data
+        for entry in entries:
+            if '_ts_epoch' not in entry:
+                entry['_ts_epoch'] = datetime.fromisoformat(entry['timestamp']).timestamp()
+            self._insert(entry)
 
-    def _save_cache(self):
-        with open(self.file_path, 'w') as f:
-            json.dump(self.cache, f)
+    def _next_slno_from_db(self) -> int:
+        # The counter persists in the meta table so serial numbers never
+        # regress when newer rows are deleted; deriving it from the rows
+        # is only the fallback for a freshly migrated database.
+        row = self.conn.execute(
+            "SELECT value FROM meta WHERE key = 'next_slno'"
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        row = self.conn.execute(
+            "SELECT MAX(CAST(LTRIM(slno, '#') AS INTEGER)) FROM signals"
+        ).fetchone()
+        return (row[0] or 0) + 1
 
     def _generate_id(self) -> str:
-        return str(uuid.uuid4())
+        self._id_counter += 1
+        return f"{int(time.time() * 1000):x}-{self._id_counter:x}"
+
+    def _insert(self, signal_data: Dict):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO signals"
+            " (id, slno, pair, strategy, direction, timeframe, active, ts, payload)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                signal_data['id'],
+                signal_data.get('slno'),
+                signal_data['pair'],
+                signal_data['strategy'],
+                signal_data['direction'],
+                signal_data['timeframe'],
+                1 if signal_data.get('active', False) else 0,
+                signal_data['_ts_epoch'],
+                orjson.dumps(signal_data).decode(),
+            ),
+        )
 
     def add_signal(self, signal: Signal):
-        signal_data = signal.dict(exclude={'data_frame'})
+        signal_data = signal.dict()
         signal_data["id"] = self._generate_id()
         signal_data["slno"] = f"#{self.next_slno:03d}"
         self.next_slno += 1
-        signal_data['timestamp'] = datetime.now().isoformat()
+        self.conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_slno', ?)",
+            (self.next_slno,),
+        )
+        now = datetime.now()
+        signal_data['timestamp'] = now.isoformat()
+        # Parsed once at insertion: the 24-hour prune compares this float
+        # instead of re-parsing the ISO string per entry per call.
+        signal_data['_ts_epoch'] = now.timestamp()
         signal_data['active'] = True
-        self.cache.append(signal_data)
-        self._save_cache()
+        self._insert(signal_data)
+        # Evict the oldest rows beyond the cap.
+        self.conn.execute(
+            "DELETE FROM signals WHERE id IN"
+            " (SELECT id FROM signals ORDER BY ts DESC LIMIT -1 OFFSET ?)",
+            (self.MAXLEN,),
+        )
+
+    def update_signal(self, signal_data: Dict):
+        # Persist in-place edits to an entry's payload — e.g. the
+        # monitor's rolled-forward close snapshot — without touching the
+        # indexed columns.
+        self.conn.execute(
+            "UPDATE signals SET payload = ? WHERE id = ?",
+            (orjson.dumps(signal_data).decode(), signal_data['id']),
+        )
 
     def remove_signal(self, signal_id: str):
-        self.cache = [s for s in self.cache if s.get('id') != signal_id]
-        self._save_cache()
+        self.conn.execute("DELETE FROM signals WHERE id = ?", (signal_id,))
 
     def signal_exists(self, signal: Signal) -> bool:
-        # Check if similar signal exists (same pair, strategy, direction)
-        for s in self.cache:
-            if (s['pair'] == signal.pair and
-                s['strategy'] == signal.strategy and
-                s['direction'] == signal.direction and
-                s["timeframe"] == signal.timeframe and
-                s["active"] is True):
-                return True
-        return False
+        # One indexed point lookup against ix_active. The runner and the
+        # monitor share this database from separate processes, so the
+        # table itself is the only view of what's active that can't go
+        # stale — a process-local key set would miss the other process's
+        # deletions.
+        return self.conn.execute(
+            "SELECT 1 FROM signals WHERE active = 1 AND pair = ?"
+            " AND strategy = ? AND direction = ? AND timeframe = ? LIMIT 1",
+            (signal.pair, signal.strategy, signal.direction, signal.timeframe),
+        ).fetchone() is not None
 
     def get_active_signals(self) -> List[Dict]:
         # Clean up old signals (>24 hours)
-        now = datetime.now()
-        self.cache = [
-            s for s in self.cache
-            if datetime.fromisoformat(s["timestamp"]) > now - timedelta(hours=24) and
-            s["timeframe"] in ["3m", "5m", "15m"]
-        ]
-        self._save_cache()
-        return [s for s in self.cache if s.get('active', False)]
+        cutoff = (datetime.now() - timedelta(hours=24)).timestamp()
+        self.conn.execute(
+            "DELETE FROM signals WHERE ts <= ?"
+            " OR timeframe NOT IN ('3m', '5m', '15m')",
+            (cutoff,),
+        )
+        rows = self.conn.execute(
+            "SELECT payload FROM signals WHERE active = 1 ORDER BY ts"
+        ).fetchall()
+        return [orjson.loads(payload) for (payload,) in rows]
 
     def clear_cache(self):
-        self.cache = []
-        self._save_cache()
-
-
-
-    def _get_next_slno(self) -> int:
-        max_slno = 0
-        for s in self.cache:
-            if 'slno' in s and s['slno'] is not None:
-                try:
-                    max_slno = max(max_slno, int(s['slno'].lstrip('#')))
-                except ValueError:
-                    pass
-        return max_slno + 1
+        self.conn.execute("DELETE FROM signals")
 
+    def flush(self):
+        # Retained for callers from the JSON-file era: every mutation
+        # already commits, so there is nothing left to write out.
+        pass
 
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None